@@ -4,11 +4,107 @@ Kakao Bot Builder API에서 시나리오를 조회하고 필터링하는 스크
 """
 
 import requests
+from requests.adapters import HTTPAdapter
 import json
 import sys
 import os
 import re
-from typing import List, Dict, Optional, Tuple
+import hashlib
+import tempfile
+import types
+from collections import namedtuple
+from concurrent.futures import Future, ThreadPoolExecutor
+from functools import lru_cache
+from pathlib import Path
+from typing import List, Dict, Optional, Sequence, Tuple
+
+try:
+    import orjson  # 선택사항: 대용량 응답 JSON 파싱 가속
+except ImportError:
+    orjson = None
+
+try:
+    import httpx  # 선택사항: HTTP/2로 모든 환경 요청을 하나의 연결에서 처리
+except ImportError:
+    httpx = None
+
+
+# 환경 선택 입력값 → 환경 이름 (읽기 전용)
+ENV_CHOICES = types.MappingProxyType({"1": "dev", "2": "prod", "3": "stg"})
+
+# 블록 정보 (검색/인덱스 결과)
+BlockHit = namedtuple('BlockHit', 'scenario_id scenario_name block_id block_name')
+
+# API 요청 타임아웃 (초)
+REQUEST_TIMEOUT = 30
+
+# 환경 간 공유하는 HTTP 세션 (커넥션 풀링 및 TLS 핸드셰이크 재사용)
+_SESSION = requests.Session()
+_SESSION.mount('https://', HTTPAdapter(pool_connections=10, pool_maxsize=10))
+
+# HTTP/2 클라이언트 (httpx와 h2 패키지가 설치된 경우만 사용, 없으면 _SESSION 사용)
+# 모든 환경이 같은 호스트(botbuilder-meta.kakao.com)이므로 하나의 연결에서 다중화됨
+_CLIENT = None
+if httpx is not None:
+    try:
+        _CLIENT = httpx.Client(
+            http2=True,
+            follow_redirects=True,  # requests.Session과 동일하게 리다이렉트를 따라감
+            limits=httpx.Limits(max_connections=10, max_keepalive_connections=10),
+            timeout=REQUEST_TIMEOUT
+        )
+    except ImportError:  # h2 패키지가 없는 경우
+        _CLIENT = None
+
+# API 요청 실패로 처리할 예외
+_HTTP_ERRORS = (requests.exceptions.RequestException, ValueError)
+if httpx is not None:
+    _HTTP_ERRORS += (httpx.HTTPError,)
+
+# 환경별 데이터를 동시에 로드하기 위한 스레드 풀 (DEV, PROD, STG)
+_EXECUTOR = ThreadPoolExecutor(max_workers=3)
+
+# .env 파일 한 줄 패턴: KEY=VALUE (주석/빈 줄은 매칭되지 않음)
+# 값이 같은 따옴표로 감싸져 있으면 따옴표 안쪽만 캡처
+_ENV_LINE = re.compile(r'''^(?!\s*#)\s*([^=]*?)\s*=\s*(?:"(.*)"|'(.*)'|(.*?))\s*$''')
+
+# YAML 한 줄 패턴: 변수명: [block_id] [# 주석]
+# block_id(24자리 16진수 문자열)가 있으면 3번째 그룹에 캡처
+# 전체 텍스트에 대해 MULTILINE으로 매칭하므로 공백은 줄바꿈을 제외한 공백([^\S\n])만 허용
+_YAML_LINE = re.compile(
+    r'^([^\S\n]*)([a-zA-Z_][a-zA-Z0-9_]*):[^\S\n]*(?:([a-f0-9]{24})[^\S\n]*)?(?:#.*)?$',
+    re.IGNORECASE | re.MULTILINE
+)
+
+
+def _json_loads(data: bytes):
+    """
+    JSON 바이트를 파싱합니다. (orjson이 있으면 orjson 사용)
+    
+    Args:
+        data: JSON 바이트
+    
+    Returns:
+        파싱된 데이터
+    """
+    if orjson is not None:
+        return orjson.loads(data)
+    return json.loads(data)
+
+
+def _json_dumps(data) -> str:
+    """
+    데이터를 보기 좋게 들여쓴 JSON 문자열로 변환합니다. (orjson이 있으면 orjson 사용)
+    
+    Args:
+        data: 변환할 데이터
+    
+    Returns:
+        JSON 문자열
+    """
+    if orjson is not None:
+        return orjson.dumps(data, option=orjson.OPT_INDENT_2).decode('utf-8')
+    return json.dumps(data, indent=2, ensure_ascii=False)
 
 
 def load_env_file(env_path: str = '.env') -> None:
@@ -24,37 +120,132 @@ def load_env_file(env_path: str = '.env') -> None:
     try:
         with open(env_path, 'r', encoding='utf-8') as f:
             for line in f:
-                line = line.strip()
-                # 주석이나 빈 줄 건너뛰기
-                if not line or line.startswith('#'):
+                # KEY=VALUE 형식 파싱 (주석이나 빈 줄은 매칭되지 않음)
+                match = _ENV_LINE.match(line)
+                if not match:
                     continue
-                # KEY=VALUE 형식 파싱
-                if '=' in line:
-                    key, value = line.split('=', 1)
-                    key = key.strip()
-                    value = value.strip()
-                    # 따옴표 제거 (시작과 끝이 같은 따옴표로 감싸져 있는 경우만)
-                    if len(value) >= 2:
-                        if (value.startswith('"') and value.endswith('"')) or \
-                           (value.startswith("'") and value.endswith("'")):
-                            value = value[1:-1]
-                    # 환경변수가 이미 설정되어 있지 않으면 설정
-                    if key and not os.getenv(key):
-                        os.environ[key] = value
+                key, double_quoted, single_quoted, plain = match.groups()
+                # 따옴표 제거 (시작과 끝이 같은 따옴표로 감싸져 있는 경우만)
+                if double_quoted is not None:
+                    value = double_quoted
+                elif single_quoted is not None:
+                    value = single_quoted
+                else:
+                    value = plain
+                # 환경변수가 이미 설정되어 있지 않으면 설정
+                if key and not os.getenv(key):
+                    os.environ[key] = value
     except Exception as e:
         print(f"⚠️  .env 파일 로드 실패: {e}", file=sys.stderr)
 
 
+def _cache_paths(api_url: str) -> Tuple[Path, Path]:
+    """
+    API URL에 해당하는 디스크 캐시 파일 경로를 반환합니다.
+    
+    Args:
+        api_url: API 엔드포인트 URL
+    
+    Returns:
+        (응답 본문 파일, 검증자(ETag/Last-Modified) 파일) 경로 튜플
+    """
+    key = hashlib.sha1(api_url.encode('utf-8')).hexdigest()
+    cache_dir = Path(tempfile.gettempdir())
+    return cache_dir / f"kakao_{key}.bin", cache_dir / f"kakao_{key}.etag"
+
+
+def _read_cache(api_url: str) -> Tuple[Optional[bytes], Dict[str, str]]:
+    """
+    디스크 캐시에서 이전 응답 본문과 검증자를 읽습니다.
+    
+    Args:
+        api_url: API 엔드포인트 URL
+    
+    Returns:
+        (응답 본문 또는 None, 검증자 딕셔너리) 튜플
+    """
+    body_path, etag_path = _cache_paths(api_url)
+    try:
+        validators = json.loads(etag_path.read_text(encoding='utf-8'))
+        return body_path.read_bytes(), validators
+    except (OSError, ValueError):
+        # 일부만 남았거나 손상된 캐시는 지우고 다음 요청부터 새로 받음
+        _remove_cache(api_url)
+        return None, {}
+
+
+def _remove_cache(api_url: str) -> None:
+    """
+    API URL에 해당하는 디스크 캐시 파일을 삭제합니다. (실패해도 무시)
+    
+    Args:
+        api_url: API 엔드포인트 URL
+    """
+    for path in _cache_paths(api_url):
+        try:
+            path.unlink()
+        except OSError:
+            pass
+
+
+def _atomic_write(path: Path, data: bytes) -> None:
+    """
+    임시 파일에 쓴 뒤 교체하여 파일을 원자적으로 저장합니다.
+    
+    Args:
+        path: 저장할 파일 경로
+        data: 저장할 데이터
+    """
+    f = tempfile.NamedTemporaryFile(dir=path.parent, prefix=path.name, delete=False)
+    try:
+        with f:
+            f.write(data)
+        os.replace(f.name, path)
+    except OSError:
+        # 쓰기/교체에 실패하면 임시 파일을 남기지 않음
+        try:
+            os.unlink(f.name)
+        except OSError:
+            pass
+        raise
+
+
+def _write_cache(api_url: str, content: bytes, etag: Optional[str], last_modified: Optional[str]) -> None:
+    """
+    응답 본문과 검증자를 디스크 캐시에 저장합니다. (실패해도 무시)
+    
+    Args:
+        api_url: API 엔드포인트 URL
+        content: 응답 본문
+        etag: ETag 응답 헤더 값
+        last_modified: Last-Modified 응답 헤더 값
+    """
+    body_path, etag_path = _cache_paths(api_url)
+    validators = {'etag': etag, 'last_modified': last_modified}
+    try:
+        # 본문을 먼저 저장해야 검증자가 이전 본문을 가리키는 일이 없음
+        _atomic_write(body_path, content)
+        _atomic_write(etag_path, json.dumps(validators).encode('utf-8'))
+    except OSError:
+        pass
+
+
 def fetch_scenarios(api_url: str, cookie: Optional[str] = None) -> Dict:
     """
     API에서 시나리오 목록을 가져옵니다.
     
+    이전 응답이 디스크에 캐시되어 있으면 조건부 요청(If-None-Match/If-Modified-Since)을 보내고,
+    서버가 304(변경 없음)를 응답하면 캐시된 데이터를 사용합니다.
+    
     Args:
         api_url: API 엔드포인트 URL
         cookie: 인증 쿠키 (선택사항)
     
     Returns:
         API 응답 데이터
+    
+    Raises:
+        RuntimeError: API 요청에 실패한 경우 (메시지에 오류 내용 포함)
     """
     headers = {
         'Content-Type': 'application/json',
@@ -66,15 +257,42 @@ def fetch_scenarios(api_url: str, cookie: Optional[str] = None) -> Dict:
     if cookie:
         headers['Cookie'] = cookie
     
+    cached_body, validators = _read_cache(api_url)
+    if cached_body is not None:
+        if validators.get('etag'):
+            headers['If-None-Match'] = validators['etag']
+        if validators.get('last_modified'):
+            headers['If-Modified-Since'] = validators['last_modified']
+    
     try:
-        response = requests.get(api_url, headers=headers)
+        client = _CLIENT if _CLIENT is not None else _SESSION
+        response = client.get(api_url, headers=headers, timeout=REQUEST_TIMEOUT)
+        # 변경 없음: 캐시된 데이터 사용
+        if response.status_code == 304 and cached_body is not None:
+            try:
+                return _json_loads(cached_body)
+            except ValueError:
+                # 캐시가 손상된 경우: 캐시를 지우고 조건부 헤더 없이 다시 요청
+                _remove_cache(api_url)
+                headers.pop('If-None-Match', None)
+                headers.pop('If-Modified-Since', None)
+                response = client.get(api_url, headers=headers, timeout=REQUEST_TIMEOUT)
         response.raise_for_status()
-        return response.json()
-    except requests.exceptions.RequestException as e:
-        print(f"API 요청 실패: {e}", file=sys.stderr)
+        data = _json_loads(response.content)
+        
+        # 성공 응답이고 검증자가 있는 경우만 캐시
+        etag = response.headers.get('ETag')
+        last_modified = response.headers.get('Last-Modified')
+        if (etag or last_modified) and isinstance(data, dict) and data.get('status') != 'fail':
+            _write_cache(api_url, response.content, etag, last_modified)
+        
+        return data
+    except _HTTP_ERRORS as e:
+        message = f"API 요청 실패: {e}"
         if hasattr(e, 'response') and e.response is not None:
-            print(f"응답 내용: {e.response.text}", file=sys.stderr)
-        sys.exit(1)
+            message += f"\n응답 내용: {e.response.text}"
+        # 여러 환경을 동시에 로드하므로 직접 출력하지 않고 호출한 쪽에서 환경 이름과 함께 출력
+        raise RuntimeError(message) from e
 
 
 def extract_items(data: Dict) -> List[Dict]:
@@ -86,28 +304,35 @@ def extract_items(data: Dict) -> List[Dict]:
     
     Returns:
         시나리오 리스트
+    
+    Raises:
+        RuntimeError: 실패 응답이거나 응답 형식을 인식할 수 없는 경우 (메시지에 오류 내용 포함)
     """
     # 에러 응답 확인
     if data.get('status') == 'fail':
         error_data = data.get('data', {})
         error_code = error_data.get('code', 'N/A')
         error_message = error_data.get('message', '알 수 없는 오류')
-        print(f"\n❌ API 요청 실패:", file=sys.stderr)
-        print(f"   코드: {error_code}", file=sys.stderr)
-        print(f"   메시지: {error_message}", file=sys.stderr)
+        lines = [
+            "API 요청 실패:",
+            f"   코드: {error_code}",
+            f"   메시지: {error_message}",
+        ]
         
         if error_code == 21001:  # 인증 실패
-            print(f"\n💡 인증 쿠키가 필요합니다.", file=sys.stderr)
-            print(f"   다음 중 하나의 방법으로 쿠키를 제공하세요:", file=sys.stderr)
-            print(f"   1. 환경변수: export KAKAO_COOKIE='your_cookie_string'", file=sys.stderr)
-            print(f"   2. 명령줄: python filter_scenarios.py --cookie='your_cookie_string'", file=sys.stderr)
+            lines += [
+                "",
+                "💡 인증 쿠키가 필요합니다.",
+                "   다음 중 하나의 방법으로 쿠키를 제공하세요:",
+                "   1. 환경변수: export KAKAO_COOKIE='your_cookie_string'",
+                "   2. 명령줄: python filter_scenarios.py --cookie='your_cookie_string'",
+            ]
         
-        sys.exit(1)
+        # 여러 환경을 동시에 로드하므로 직접 출력하지 않고 호출한 쪽에서 환경 이름과 함께 출력
+        raise RuntimeError('\n'.join(lines))
     
     if 'data' not in data:
-        print("응답에 'data' 필드가 없습니다.", file=sys.stderr)
-        print(f"응답 내용: {json.dumps(data, indent=2, ensure_ascii=False)}")
-        sys.exit(1)
+        raise RuntimeError(f"응답에 'data' 필드가 없습니다.\n응답 내용: {_json_dumps(data)}")
     
     # data가 배열인 경우 (성공 응답)
     if isinstance(data['data'], list):
@@ -117,9 +342,57 @@ def extract_items(data: Dict) -> List[Dict]:
     if isinstance(data['data'], dict) and 'items' in data['data']:
         return data['data']['items']
     
-    print("응답 형식을 인식할 수 없습니다.", file=sys.stderr)
-    print(f"응답 내용: {json.dumps(data, indent=2, ensure_ascii=False)}")
-    sys.exit(1)
+    raise RuntimeError(f"응답 형식을 인식할 수 없습니다.\n응답 내용: {_json_dumps(data)}")
+
+
+def build_indexes(scenarios: List[Dict]) -> Tuple[Dict[str, BlockHit], Dict[str, Dict[str, BlockHit]], List[Tuple[BlockHit, str]]]:
+    """
+    시나리오 리스트를 한 번 순회하여 검색용 인덱스를 생성합니다.
+    
+    Args:
+        scenarios: 시나리오 리스트
+    
+    Returns:
+        (by_block_id, by_scenario_name, flat_blocks) 튜플
+        - by_block_id: {block_id: BlockHit}
+        - by_scenario_name: {scenario_name: {block_name: BlockHit}}
+        - flat_blocks: (BlockHit, block_name_lower) 리스트
+    """
+    by_block_id = {}
+    by_scenario_name = {}
+    flat_blocks = []
+    
+    # 반복문 안에서 자주 쓰는 메서드는 지역 변수로 바인딩
+    set_block_id = by_block_id.setdefault
+    append_flat = flat_blocks.append
+    
+    for scenario in scenarios:
+        scenario_get = scenario.get
+        scenario_id = scenario_get('id', 'N/A')
+        scenario_name = scenario_get('name', 'N/A')
+        items = scenario_get('items', [])
+        
+        # 같은 이름의 시나리오가 여러 개면 첫 번째 시나리오 기준
+        set_block_name = None
+        raw_scenario_name = scenario_get('name')
+        if raw_scenario_name not in by_scenario_name:
+            set_block_name = by_scenario_name.setdefault(raw_scenario_name, {}).setdefault
+        
+        for item in items:
+            item_get = item.get
+            block_id = item_get('id', 'N/A')
+            block_info = BlockHit(scenario_id, scenario_name, block_id, item_get('name', 'N/A'))
+            # 중복 시 처음 찾은 블록 기준 (블록 ID 검색/검증 모두 이 규칙을 따름)
+            # ID가 없는 블록은 'N/A'로 검색되지 않도록 인덱스에서 제외
+            raw_block_id = item_get('id')
+            if raw_block_id is not None:
+                set_block_id(raw_block_id, block_info)
+            if set_block_name is not None:
+                set_block_name(item_get('name'), block_info)
+            # 이름 검색용 (소문자 변환은 여기서 한 번만 수행, 이름 없는 블록은 검색되지 않음)
+            append_flat((block_info, item_get('name', '').lower()))
+    
+    return by_block_id, by_scenario_name, flat_blocks
 
 
 def display_all_scenarios(scenarios: List[Dict]):
@@ -133,71 +406,60 @@ def display_all_scenarios(scenarios: List[Dict]):
         print("시나리오가 없습니다.")
         return
     
-    print(f"\n총 {len(scenarios)}개의 시나리오:\n")
-    print("=" * 80)
+    # 출력할 줄을 모아서 한 번에 기록
+    out = []
+    out.append(f"\n총 {len(scenarios)}개의 시나리오:\n")
+    out.append("=" * 80)
     
     for scenario in scenarios:
         scenario_id = scenario.get('id', 'N/A')
         scenario_name = scenario.get('name', 'N/A')
         items = scenario.get('items', [])
         
-        print(f"시나리오 ID: {scenario_id}")
-        print(f"시나리오 Name: {scenario_name}")
-        print(f"블록 개수: {len(items)}")
-        print("-" * 80)
+        out.append(f"시나리오 ID: {scenario_id}")
+        out.append(f"시나리오 Name: {scenario_name}")
+        out.append(f"블록 개수: {len(items)}")
+        out.append("-" * 80)
         
         if items:
             # 블록 ID와 Name을 쌍으로 묶어서 출력
             for idx, item in enumerate(items, 1):
-                block_id = item.get('id', 'N/A')
-                block_name = item.get('name', 'N/A')
-                print(f"  [{idx}] 블록 ID: {block_id} | 블록 Name: {block_name}")
+                item_get = item.get
+                block_id = item_get('id', 'N/A')
+                block_name = item_get('name', 'N/A')
+                out.append(f"  [{idx}] 블록 ID: {block_id} | 블록 Name: {block_name}")
         else:
-            print("  (블록이 없습니다)")
+            out.append("  (블록이 없습니다)")
         
-        print("=" * 80)
-        print()
+        out.append("=" * 80)
+        out.append("")
+    
+    sys.stdout.write('\n'.join(out) + '\n')
 
 
-def search_blocks(scenarios: List[Dict], search_term: str) -> List[Dict]:
+def search_blocks(flat_blocks: List[Tuple[BlockHit, str]], search_term_lower: str) -> List[BlockHit]:
     """
     시나리오의 블록들에서 검색어로 필터링합니다.
     
     Args:
-        scenarios: 시나리오 리스트
-        search_term: 검색어
+        flat_blocks: build_indexes()로 생성한 블록 리스트
+        search_term_lower: 소문자로 변환된 검색어
     
     Returns:
         필터링된 블록 리스트 (시나리오 정보 포함)
     """
-    if not search_term:
+    if not search_term_lower:
         return []
     
-    search_term_lower = search_term.lower()
-    results = []
-    
-    for scenario in scenarios:
-        scenario_id = scenario.get('id', 'N/A')
-        scenario_name = scenario.get('name', 'N/A')
-        items = scenario.get('items', [])
-        
-        for item in items:
-            block_id = item.get('id', 'N/A')
-            block_name = item.get('name', '')
-            
-            # 블록 이름에서 검색
-            if search_term_lower in block_name.lower():
-                results.append({
-                    'scenario_id': scenario_id,
-                    'scenario_name': scenario_name,
-                    'block_id': block_id,
-                    'block_name': block_name
-                })
-    
-    return results
+    # 블록 이름에서 검색 (미리 소문자로 변환해 둔 이름 사용)
+    return [
+        block_info
+        for block_info, block_name_lower in flat_blocks
+        if search_term_lower in block_name_lower
+    ]
 
 
-def display_search_results(results: List[Dict]):
+def display_search_results(results: List[BlockHit]):
     """
     검색 결과를 출력합니다.
     
@@ -212,160 +474,116 @@ def display_search_results(results: List[Dict]):
     print("-" * 80)
     
     for idx, result in enumerate(results, 1):
-        print(f"[{idx}] 시나리오 ID: {result['scenario_id']} | 시나리오 Name: {result['scenario_name']}")
-        print(f"    블록 ID: {result['block_id']} | 블록 Name: {result['block_name']}")
+        print(f"[{idx}] 시나리오 ID: {result.scenario_id} | 시나리오 Name: {result.scenario_name}")
+        print(f"    블록 ID: {result.block_id} | 블록 Name: {result.block_name}")
         print("-" * 80)
 
 
-def search_blocks_by_id(scenarios: List[Dict], block_id: str) -> Optional[Dict]:
+def search_blocks_by_id(index: Tuple[Dict, Dict, List], block_id: str) -> Optional[BlockHit]:
     """
     블록 ID로 블록을 검색합니다.
     
     Args:
-        scenarios: 시나리오 리스트
+        index: build_indexes()로 생성한 환경 인덱스
         block_id: 검색할 블록 ID
     
     Returns:
         찾은 블록 정보 또는 None
     """
-    for scenario in scenarios:
-        scenario_id = scenario.get('id', 'N/A')
-        scenario_name = scenario.get('name', 'N/A')
-        items = scenario.get('items', [])
-        
-        for item in items:
-            if item.get('id') == block_id:
-                return {
-                    'scenario_id': scenario_id,
-                    'scenario_name': scenario_name,
-                    'block_id': block_id,
-                    'block_name': item.get('name', 'N/A')
-                }
-    
-    return None
+    return index[0].get(block_id)
 
 
-def find_matching_blocks_in_other_envs(env_scenarios: Dict[str, List[Dict]], 
+def find_matching_blocks_in_other_envs(env_indexes: Dict[str, Tuple[Dict, Dict, List]], 
                                         source_env: str, 
                                         scenario_name: str, 
-                                        block_name: str) -> Dict[str, Optional[Dict]]:
+                                        block_name: str) -> Dict[str, Optional[BlockHit]]:
     """
     다른 환경에서 동일한 시나리오의 블록을 찾습니다.
     
     Args:
-        env_scenarios: 환경별 시나리오 딕셔너리
+        env_indexes: 환경별 인덱스 딕셔너리 {env_name: build_indexes() 결과}
         source_env: 원본 환경 이름
         scenario_name: 시나리오 이름
         block_name: 블록 이름
     
     Returns:
-        환경별 블록 정보 딕셔너리 {env_name: block_info or None}
+        원본 환경을 제외한 환경별 블록 정보 딕셔너리 {env_name: block_info or None}
     """
     results = {}
     
-    for env_name, scenarios in env_scenarios.items():
-        if not scenarios:
-            results[env_name] = None
-            continue
-        
-        # 같은 시나리오 이름 찾기
-        matching_scenario = None
-        for scenario in scenarios:
-            if scenario.get('name') == scenario_name:
-                matching_scenario = scenario
-                break
-        
-        if not matching_scenario:
-            results[env_name] = None
+    for env_name, index in env_indexes.items():
+        # 원본 환경은 이미 블록을 찾았으므로 건너뛰기
+        if env_name == source_env:
             continue
-        
-        # 같은 블록 이름 찾기
-        items = matching_scenario.get('items', [])
-        matching_block = None
-        for item in items:
-            if item.get('name') == block_name:
-                matching_block = {
-                    'scenario_id': matching_scenario.get('id', 'N/A'),
-                    'scenario_name': scenario_name,
-                    'block_id': item.get('id', 'N/A'),
-                    'block_name': block_name
-                }
-                break
-        
-        results[env_name] = matching_block
+        # 같은 시나리오 이름의 같은 블록 이름 찾기
+        results[env_name] = index[1].get(scenario_name, {}).get(block_name)
     
     return results
 
 
-def search_blocks_multi_env(env_scenarios: Dict[str, List[Dict]], search_term: str) -> Dict[str, List[Dict]]:
+def search_blocks_multi_env(env_indexes: Dict[str, Tuple[Dict, Dict, List]], search_term: str) -> Dict[str, List[BlockHit]]:
     """
     여러 환경에서 블록을 검색합니다.
     
     Args:
-        env_scenarios: 환경별 시나리오 딕셔너리 {env_name: scenarios}
+        env_indexes: 환경별 인덱스 딕셔너리 {env_name: build_indexes() 결과}
         search_term: 검색어 (블록 이름 또는 블록 ID)
     
     Returns:
         환경별 검색 결과 딕셔너리 {env_name: results}
     """
+    # 검색어 소문자 변환은 모든 환경에 대해 한 번만 수행
+    search_term_lower = search_term.lower()
     results = {}
     
-    for env_name, scenarios in env_scenarios.items():
-        if scenarios:
-            results[env_name] = search_blocks(scenarios, search_term)
-        else:
-            results[env_name] = []
+    for env_name, index in env_indexes.items():
+        results[env_name] = search_blocks(index[2], search_term_lower)
     
     return results
 
 
-def search_by_block_id_multi_env(env_scenarios: Dict[str, List[Dict]], block_id: str) -> Dict[str, Optional[Dict]]:
+def search_by_block_id_multi_env(env_indexes: Dict[str, Tuple[Dict, Dict, List]], block_id: str) -> Dict[str, Optional[BlockHit]]:
     """
     여러 환경에서 블록 ID로 검색하고, 다른 환경의 동일 블록을 찾습니다.
     
     Args:
-        env_scenarios: 환경별 시나리오 딕셔너리
+        env_indexes: 환경별 인덱스 딕셔너리 {env_name: build_indexes() 결과}
         block_id: 검색할 블록 ID
     
     Returns:
         환경별 블록 정보 딕셔너리 {env_name: block_info or None}
     """
-    # 모든 환경에서 해당 block id 찾기
-    found_blocks = {}
-    source_info = None
-    
-    for env_name, scenarios in env_scenarios.items():
-        if scenarios:
-            block_info = search_blocks_by_id(scenarios, block_id)
-            found_blocks[env_name] = block_info
-            if block_info and source_info is None:
-                source_info = block_info
-                source_info['env'] = env_name
-        else:
-            found_blocks[env_name] = None
-    
-    # source_info가 있으면, 다른 환경에서 같은 시나리오의 같은 블록 찾기
-    if source_info:
-        scenario_name = source_info['scenario_name']
-        block_name = source_info['block_name']
+    # 모든 환경에서 해당 block id 찾기 (환경별 인덱스 조회)
+    found_blocks = {env_name: index[0].get(block_id) for env_name, index in env_indexes.items()}
+    
+    # 처음 찾은 환경의 블록 정보를 기준으로 사용
+    source_env, source_info = next(
+        ((env_name, block_info) for env_name, block_info in found_blocks.items() if block_info),
+        (None, None)
+    )
+    
+    # source_info가 있고 블록 ID로 찾지 못한 환경이 있을 때만, 다른 환경에서 같은 시나리오의 같은 블록 찾기
+    if source_info and any(block_info is None for block_info in found_blocks.values()):
+        scenario_name = source_info.scenario_name
+        block_name = source_info.block_name
         
         # 다른 환경에서 매칭되는 블록 찾기
         matching_blocks = find_matching_blocks_in_other_envs(
-            env_scenarios, 
-            source_info['env'], 
+            env_indexes, 
+            source_env, 
             scenario_name, 
             block_name
         )
         
         # 찾은 블록과 매칭된 블록 병합
-        for env_name in matching_blocks:
-            if matching_blocks[env_name] and not found_blocks[env_name]:
-                found_blocks[env_name] = matching_blocks[env_name]
+        for env_name, matching_block in matching_blocks.items():
+            if matching_block and not found_blocks[env_name]:
+                found_blocks[env_name] = matching_block
     
     return found_blocks
 
 
-def display_block_id_search_results(env_results: Dict[str, Optional[Dict]], search_block_id: str):
+def display_block_id_search_results(env_results: Dict[str, Optional[BlockHit]], search_block_id: str):
     """
     블록 ID 검색 결과를 출력합니다.
     
@@ -373,152 +591,135 @@ def display_block_id_search_results(env_results: Dict[str, Optional[Dict]], sear
         env_results: 환경별 블록 정보 딕셔너리
         search_block_id: 검색한 블록 ID
     """
-    found_count = sum(1 for result in env_results.values() if result is not None)
-    
-    if found_count == 0:
+    # 첫 번째로 찾은 블록 정보 (없으면 검색 실패)
+    first_result = next((result for result in env_results.values() if result), None)
+    if first_result is None:
         print(f"블록 ID '{search_block_id}'를 찾을 수 없습니다.")
         return
     
-    # 첫 번째로 찾은 블록 정보
-    first_result = next((result for result in env_results.values() if result), None)
-    if first_result:
-        print(f"\n블록 ID '{search_block_id}' 검색 결과:")
-        print(f"시나리오: {first_result['scenario_name']}")
-        print(f"블록 Name: {first_result['block_name']}")
-        print("=" * 80)
+    print(f"\n블록 ID '{search_block_id}' 검색 결과:")
+    print(f"시나리오: {first_result.scenario_name}")
+    print(f"블록 Name: {first_result.block_name}")
+    print("=" * 80)
     
     for env_name in ['dev', 'prod', 'stg']:
         if env_name in env_results:
             result = env_results[env_name]
             if result:
-                print(f"[{env_name.upper()}] 시나리오 ID: {result['scenario_id']} | 블록 ID: {result['block_id']}")
+                print(f"[{env_name.upper()}] 시나리오 ID: {result.scenario_id} | 블록 ID: {result.block_id}")
             else:
                 print(f"[{env_name.upper()}] 없음")
     
     print("=" * 80)
 
 
-def parse_block_ids_from_text(text: str) -> List[Tuple[str, str, int]]:
+@lru_cache(maxsize=16)
+def parse_block_ids_from_text(text: str) -> Tuple[Tuple[str, str, int], ...]:
     """
     YAML 형식의 텍스트에서 블록 ID를 파싱합니다.
     
+    같은 텍스트를 여러 환경에 대해 검증하는 경우가 많아 결과를 캐시합니다.
+    (캐시된 결과가 변경되지 않도록 튜플로 반환)
+    
     Args:
         text: YAML 형식의 텍스트
     
     Returns:
-        (block_id, path, line_number) 튜플 리스트
+        (block_id, path, line_number) 튜플의 튜플
     """
     block_ids = []
-    lines = text.split('\n')
-    path_stack = []  # 계층 구조 추적
-    # 블록 ID 패턴: 변수명: block_id # 주석 형식
-    # block_id는 24자리 16진수 문자열
-    block_id_pattern = re.compile(r'^(\s*)([a-zA-Z_][a-zA-Z0-9_]*):\s*([a-f0-9]{24})\s*(?:#.*)?$', re.IGNORECASE)
-    
-    for line_num, line in enumerate(lines, 1):
-        original_line = line
-        line = line.rstrip()
+    # 계층 구조 추적: (전체 경로, 들여쓰기) 튜플 스택
+    # 상위 경로 문자열을 함께 저장해 두어 매 줄마다 경로 전체를 다시 join하지 않음
+    path_stack = []
+    line_num = 1
+    last_pos = 0
+    
+    # 반복문 안에서 자주 쓰는 메서드는 지역 변수로 바인딩
+    count_in_text = text.count
+    add_block_id = block_ids.append
+    push_path = path_stack.append
+    pop_path = path_stack.pop
+    
+    # 변수명: [block_id] [# 주석] 형식의 줄만 순회 (빈 줄, 주석만 있는 줄은 매칭되지 않음)
+    for match in _YAML_LINE.finditer(text):
+        # 이전 매칭 이후의 줄바꿈 개수로 현재 줄 번호 계산
+        start = match.start()
+        line_num += count_in_text('\n', last_pos, start)
+        last_pos = start
         
-        # 빈 줄 건너뛰기
-        if not line.strip():
-            continue
+        indent_str, var_name, block_id = match.group(1, 2, 3)
+        indent = len(indent_str)
         
-        # 주석만 있는 줄 건너뛰기
-        stripped = line.strip()
-        if stripped.startswith('#'):
-            continue
+        # 현재 들여쓰기 레벨에 맞게 path_stack 조정
+        while path_stack and path_stack[-1][1] >= indent:
+            pop_path()
         
-        # 블록 ID 패턴 매칭 (변수명: block_id # 주석 형식)
-        match = block_id_pattern.match(line)
-        if match:
-            indent = len(match.group(1))
-            var_name = match.group(2)
-            block_id = match.group(3)
-            
-            # 현재 들여쓰기 레벨에 맞게 path_stack 조정
-            while path_stack and path_stack[-1][1] >= indent:
-                path_stack.pop()
-            
-            # 경로 구성
-            if path_stack:
-                path = '.'.join([p[0] for p in path_stack] + [var_name])
-            else:
-                path = var_name
-            
-            path_stack.append((var_name, indent))
-            block_ids.append((block_id, path, line_num))
+        # 경로 구성 (상위 경로 + 현재 변수명)
+        if path_stack:
+            path = f"{path_stack[-1][0]}.{var_name}"
         else:
-            # 블록 ID가 아닌 키-값 쌍인 경우 (예: hsptlzInfo: # 입원 확인)
-            # 경로 스택에 추가만 하고 블록 ID는 추가하지 않음
-            key_value_pattern = re.compile(r'^(\s*)([a-zA-Z_][a-zA-Z0-9_]*):\s*(?:#.*)?$')
-            key_match = key_value_pattern.match(line)
-            if key_match:
-                indent = len(key_match.group(1))
-                var_name = key_match.group(2)
-                
-                # 현재 들여쓰기 레벨에 맞게 path_stack 조정
-                while path_stack and path_stack[-1][1] >= indent:
-                    path_stack.pop()
-                
-                path_stack.append((var_name, indent))
+            path = var_name
+        
+        # 블록 ID가 있는 경우만 결과에 추가
+        # 블록 ID가 아닌 키-값 쌍인 경우 (예: hsptlzInfo: # 입원 확인) 경로 스택에만 추가
+        if block_id is not None:
+            add_block_id((block_id, path, line_num))
+        
+        push_path((path, indent))
     
-    return block_ids
+    return tuple(block_ids)
+
+
+# 무효한 블록 ID 검증 결과 템플릿 (block_id, path, line_number만 채워서 사용)
+_INVALID_TEMPLATE = {
+    'block_id': None,
+    'path': None,
+    'line_number': None,
+    'valid': False,
+    'scenario_id': None,
+    'scenario_name': None,
+    'block_name': None
+}
 
 
-def validate_block_ids(block_ids: List[Tuple[str, str, int]], 
-                       scenarios: List[Dict], 
+def validate_block_ids(block_ids: Sequence[Tuple[str, str, int]], 
+                       index: Tuple[Dict, Dict, List], 
                        env_name: str) -> List[Dict]:
     """
     블록 ID 목록이 해당 환경에서 유효한지 검증합니다.
     
+    환경 로드 시 한 번 만들어 둔 블록 ID 인덱스(딕셔너리)로 조회하므로
+    블록 ID 하나당 검증 비용은 O(1)입니다.
+    
     Args:
-        block_ids: (block_id, path, line_number) 튜플 리스트
-        scenarios: 시나리오 리스트
-        scenarios: 환경 이름
+        block_ids: (block_id, path, line_number) 튜플 시퀀스
+        index: build_indexes()로 생성한 환경 인덱스
+        env_name: 환경 이름
     
     Returns:
         검증 결과 리스트
     """
-    # 모든 블록 ID를 딕셔너리로 변환 (빠른 검색을 위해)
-    all_blocks = {}
-    for scenario in scenarios:
-        scenario_id = scenario.get('id', 'N/A')
-        scenario_name = scenario.get('name', 'N/A')
-        items = scenario.get('items', [])
-        
-        for item in items:
-            block_id = item.get('id', 'N/A')
-            block_name = item.get('name', 'N/A')
-            all_blocks[block_id] = {
-                'scenario_id': scenario_id,
-                'scenario_name': scenario_name,
-                'block_name': block_name
-            }
-    
-    # 검증 결과
-    results = []
-    for block_id, path, line_num in block_ids:
-        if block_id in all_blocks:
-            block_info = all_blocks[block_id]
-            results.append({
+    # 로드 시 미리 만들어 둔 블록 ID 인덱스 사용
+    # 같은 블록 ID가 여러 번 나오면 블록 ID 검색과 같이 처음 찾은 블록 기준으로 검증
+    all_blocks = index[0]
+    
+    # 검증 결과 (입력 개수만큼 미리 할당)
+    results = [None] * len(block_ids)
+    for i, (block_id, path, line_num) in enumerate(block_ids):
+        block_info = all_blocks.get(block_id)
+        if block_info is not None:
+            scenario_id, scenario_name, _, block_name = block_info
+            results[i] = {
                 'block_id': block_id,
                 'path': path,
                 'line_number': line_num,
                 'valid': True,
-                'scenario_id': block_info['scenario_id'],
-                'scenario_name': block_info['scenario_name'],
-                'block_name': block_info['block_name']
-            })
+                'scenario_id': scenario_id,
+                'scenario_name': scenario_name,
+                'block_name': block_name
+            }
         else:
-            results.append({
-                'block_id': block_id,
-                'path': path,
-                'line_number': line_num,
-                'valid': False,
-                'scenario_id': None,
-                'scenario_name': None,
-                'block_name': None
-            })
+            results[i] = {**_INVALID_TEMPLATE, 'block_id': block_id, 'path': path, 'line_number': line_num}
     
     return results
 
@@ -534,35 +735,38 @@ def display_validation_results(results: List[Dict], env_name: str):
     valid_count = sum(1 for r in results if r['valid'])
     invalid_count = len(results) - valid_count
     
-    print(f"\n[{env_name.upper()}] 블록 ID 검증 결과")
-    print("=" * 80)
-    print(f"총 {len(results)}개 중 유효: {valid_count}개, 무효: {invalid_count}개\n")
+    # 출력할 줄을 모아서 한 번에 기록
+    out = []
+    out.append(f"\n[{env_name.upper()}] 블록 ID 검증 결과")
+    out.append("=" * 80)
+    out.append(f"총 {len(results)}개 중 유효: {valid_count}개, 무효: {invalid_count}개\n")
     
     # 유효한 블록들
     if valid_count > 0:
-        print("✓ 유효한 블록 ID:")
-        print("-" * 80)
+        out.append("✓ 유효한 블록 ID:")
+        out.append("-" * 80)
         for result in results:
             if result['valid']:
-                print(f"  [{result['line_number']:3d}] {result['path']}")
-                print(f"       블록 ID: {result['block_id']}")
-                print(f"       시나리오: {result['scenario_name']} | 블록: {result['block_name']}")
-                print()
+                out.append(f"  [{result['line_number']:3d}] {result['path']}")
+                out.append(f"       블록 ID: {result['block_id']}")
+                out.append(f"       시나리오: {result['scenario_name']} | 블록: {result['block_name']}")
+                out.append("")
     
     # 무효한 블록들
     if invalid_count > 0:
-        print("✗ 무효한 블록 ID:")
-        print("-" * 80)
+        out.append("✗ 무효한 블록 ID:")
+        out.append("-" * 80)
         for result in results:
             if not result['valid']:
-                print(f"  [{result['line_number']:3d}] {result['path']}")
-                print(f"       블록 ID: {result['block_id']} - 해당 환경에서 찾을 수 없음")
-                print()
+                out.append(f"  [{result['line_number']:3d}] {result['path']}")
+                out.append(f"       블록 ID: {result['block_id']} - 해당 환경에서 찾을 수 없음")
+                out.append("")
     
-    print("=" * 80)
+    out.append("=" * 80)
+    sys.stdout.write('\n'.join(out) + '\n')
 
 
-def display_search_results_multi_env(env_results: Dict[str, List[Dict]]):
+def display_search_results_multi_env(env_results: Dict[str, List[BlockHit]]):
     """
     여러 환경의 검색 결과를 비교하여 출력합니다.
     
@@ -576,15 +780,17 @@ def display_search_results_multi_env(env_results: Dict[str, List[Dict]]):
         print("검색 결과가 없습니다.")
         return
     
-    print(f"\n총 {total_count}개의 블록을 찾았습니다:\n")
+    # 출력할 줄을 모아서 한 번에 기록
+    out = []
+    out.append(f"\n총 {total_count}개의 블록을 찾았습니다:\n")
     
     # 블록 이름 기준으로 그룹화
     block_groups = {}
     
     for env_name, results in env_results.items():
         for result in results:
-            block_name = result['block_name']
-            scenario_name = result['scenario_name']
+            block_name = result.block_name
+            scenario_name = result.scenario_name
             key = f"{scenario_name}::{block_name}"
             
             if key not in block_groups:
@@ -595,31 +801,33 @@ def display_search_results_multi_env(env_results: Dict[str, List[Dict]]):
                 }
             
             block_groups[key]['envs'][env_name] = {
-                'scenario_id': result['scenario_id'],
-                'block_id': result['block_id']
+                'scenario_id': result.scenario_id,
+                'block_id': result.block_id
             }
     
     # 결과 출력
-    print("=" * 80)
+    out.append("=" * 80)
     for idx, (key, group) in enumerate(sorted(block_groups.items()), 1):
-        print(f"[{idx}] 시나리오: {group['scenario_name']}")
-        print(f"    블록 Name: {group['block_name']}")
-        print("-" * 80)
+        out.append(f"[{idx}] 시나리오: {group['scenario_name']}")
+        out.append(f"    블록 Name: {group['block_name']}")
+        out.append("-" * 80)
         
         for env_name in ['dev', 'prod', 'stg']:
             if env_name in group['envs']:
                 env_data = group['envs'][env_name]
-                print(f"    [{env_name.upper()}] 시나리오 ID: {env_data['scenario_id']} | 블록 ID: {env_data['block_id']}")
+                out.append(f"    [{env_name.upper()}] 시나리오 ID: {env_data['scenario_id']} | 블록 ID: {env_data['block_id']}")
             else:
-                print(f"    [{env_name.upper()}] 없음")
+                out.append(f"    [{env_name.upper()}] 없음")
         
-        print("=" * 80)
-        print()
+        out.append("=" * 80)
+        out.append("")
+    
+    sys.stdout.write('\n'.join(out) + '\n')
 
 
-def load_environment_data(env_name: str, api_url: str, cookie: Optional[str]) -> Optional[List[Dict]]:
+def request_environment_data(env_name: str, api_url: str, cookie: Optional[str]) -> Optional[Future]:
     """
-    특정 환경의 시나리오 데이터를 로드합니다.
+    특정 환경의 시나리오 데이터 로드를 스레드 풀에 요청합니다. (결과를 기다리지 않음)
     
     Args:
         env_name: 환경 이름 (dev, prod, stg)
@@ -627,21 +835,39 @@ def load_environment_data(env_name: str, api_url: str, cookie: Optional[str]) ->
         cookie: 인증 쿠키
     
     Returns:
-        시나리오 리스트 또는 None (실패 시)
+        시나리오 리스트를 결과로 갖는 Future 또는 None (쿠키가 없는 경우)
     """
     print(f"\n[{env_name.upper()}] API 요청 중: {api_url}")
     if not cookie:
         print(f"⚠️  [{env_name.upper()}] 인증 쿠키가 제공되지 않았습니다.")
         return None
     
+    # 워커 스레드에서는 출력하지 않음 (결과와 오류는 load_environment_data에서 출력)
+    return _EXECUTOR.submit(lambda: extract_items(fetch_scenarios(api_url, cookie)))
+
+
+def load_environment_data(env_name: str, future: Optional[Future]) -> Optional[List[Dict]]:
+    """
+    특정 환경의 시나리오 데이터 로드가 끝날 때까지 기다린 뒤 결과를 반환합니다.
+    
+    Args:
+        env_name: 환경 이름 (dev, prod, stg)
+        future: request_environment_data()가 반환한 Future
+    
+    Returns:
+        시나리오 리스트 또는 None (실패 시)
+    """
+    if future is None:
+        return None
+    
     try:
-        response_data = fetch_scenarios(api_url, cookie)
-        scenarios = extract_items(response_data)
-        print(f"✓ [{env_name.upper()}] 총 {len(scenarios)}개의 시나리오를 가져왔습니다.")
-        return scenarios
+        scenarios = future.result()
     except Exception as e:
         print(f"❌ [{env_name.upper()}] 데이터 로드 실패: {e}", file=sys.stderr)
         return None
+    
+    print(f"✓ [{env_name.upper()}] 총 {len(scenarios)}개의 시나리오를 가져왔습니다.")
+    return scenarios
 
 
 def compare_environments(env_data: Dict[str, List[Dict]]):
@@ -672,13 +898,16 @@ def compare_environments(env_data: Dict[str, List[Dict]]):
     
     print(f"\n총 {len(all_scenario_names)}개의 고유 시나리오 발견\n")
     
+    # 출력 순서대로 환경별 시나리오 딕셔너리를 미리 조회 (없는 환경은 빈 딕셔너리)
+    ordered_envs = [(env_name, env_scenarios.get(env_name, {})) for env_name in ['dev', 'prod', 'stg']]
+    
     for scenario_name in all_scenario_names:
         print(f"시나리오: {scenario_name}")
         print("-" * 80)
         
-        for env_name in ['dev', 'prod', 'stg']:
-            if env_name in env_scenarios and scenario_name in env_scenarios[env_name]:
-                scenario = env_scenarios[env_name][scenario_name]
+        for env_name, scenarios_dict in ordered_envs:
+            scenario = scenarios_dict.get(scenario_name)
+            if scenario is not None:
                 scenario_id = scenario.get('id', 'N/A')
                 items_count = len(scenario.get('items', []))
                 print(f"  [{env_name.upper()}] ID: {scenario_id} | 블록 개수: {items_count}")
@@ -690,12 +919,63 @@ def compare_environments(env_data: Dict[str, List[Dict]]):
     print("=" * 80)
 
 
+# 메인 메뉴 (한 번의 write로 출력)
+MENU_STR = (
+    "=" * 80 + "\n"
+    "명령어:\n"
+    "  0 또는 exit - 프로그램 종료\n"
+    "  1 - DEV 환경 전체 시나리오 출력\n"
+    "  2 - PROD 환경 전체 시나리오 출력\n"
+    "  3 - STG 환경 전체 시나리오 출력\n"
+    "  4 - 환경별 시나리오 비교\n"
+    "  5 - 블록 검색 모드 (DEV, PROD, STG 모든 환경)\n"
+    "  6 - 블록 ID 검증 (YAML 형식 텍스트)\n"
+    "  ? 또는 help - 명령어 목록 다시 보기\n"
+    + "=" * 80 + "\n"
+)
+
+# 블록 ID 검증 환경 선택 안내 (한 번의 write로 출력)
+ENV_SELECT_STR = (
+    "\n검증할 환경을 선택하세요:\n"
+    "  1 - DEV\n"
+    "  2 - PROD\n"
+    "  3 - STG\n"
+)
+
+
+def read_stdin_line(prompt: str = '') -> str:
+    """
+    readline 처리 없이 stdin에서 한 줄을 읽습니다. (stdin이 파이프인 경우 input() 대신 사용)
+    
+    Args:
+        prompt: 입력 전에 출력할 프롬프트
+    
+    Returns:
+        줄바꿈을 제외한 입력 문자열
+    """
+    sys.stdout.write(prompt)
+    sys.stdout.flush()
+    line = sys.stdin.readline()
+    # input()과 동일하게 입력이 끝나면 EOFError 발생
+    if not line:
+        raise EOFError
+    return line.rstrip('\n')
+
+
+def print_menu():
+    """
+    메인 메뉴를 출력합니다.
+    """
+    sys.stdout.write(MENU_STR)
+    sys.stdout.flush()
+
+
 def main():
     # .env 파일에서 환경변수 로드
     load_env_file()
     
-    # 환경별 API URL 정의 (환경변수에서 가져오기)
-    environments = {
+    # 환경별 API URL 정의 (환경변수에서 가져오기, 생성 후에는 읽기 전용)
+    environments = types.MappingProxyType({
         'dev': {
             'url': os.getenv('KAKAO_API_URL_DEV', 'https://botbuilder-meta.kakao.com/api/v2/bots/64bf85d984644d346efe4068/scenarios'),
             'cookie_key': 'KAKAO_COOKIE_DEV'
@@ -708,115 +988,111 @@ def main():
             'url': os.getenv('KAKAO_API_URL_STG', 'https://botbuilder-meta.kakao.com/api/v2/bots/67d26be819ec670b29b1bb42/scenarios'),
             'cookie_key': 'KAKAO_COOKIE_STG'
         }
-    }
+    })
     
     # 환경별 데이터 저장소
     env_scenarios = {}
+    # 환경별 검색 인덱스 (로드 시 한 번만 생성)
+    env_indexes = {}
+    
+    def store_environment(env_name: str, scenarios: List[Dict]):
+        env_scenarios[env_name] = scenarios
+        index = env_indexes[env_name] = build_indexes(scenarios)
+        return index
+    
+    # 환경별 인증 쿠키 (시작 시 한 번만 조회)
+    cookies = {
+        env_name: os.getenv(env_config['cookie_key']) or (os.getenv('KAKAO_COOKIE') if env_name == 'dev' else None)  # 하위 호환성
+        for env_name, env_config in environments.items()
+    }
     
-    # 초기 로드: dev 환경만 먼저 로드
-    dev_env = environments['dev']
-    dev_cookie = os.getenv(dev_env['cookie_key']) or os.getenv('KAKAO_COOKIE')  # 하위 호환성
-    dev_scenarios = load_environment_data('dev', dev_env['url'], dev_cookie)
-    if dev_scenarios:
-        env_scenarios['dev'] = dev_scenarios
+    # 환경별 진행 중인 로드 요청 (결과를 받으면 제거)
+    env_futures = {}
+    
+    def request_environment(env_name: str):
+        env_futures[env_name] = request_environment_data(env_name, environments[env_name]['url'], cookies[env_name])
+    
+    def get_environment(env_name: str):
+        # 해당 환경의 로드가 끝날 때까지 기다린 뒤 인덱스 반환 (실패 시 None)
+        # 이전 로드가 실패했으면 다시 요청
+        index = env_indexes.get(env_name)
+        if index is None:
+            if env_name not in env_futures:
+                request_environment(env_name)
+            scenarios = load_environment_data(env_name, env_futures.pop(env_name))
+            if scenarios:
+                index = store_environment(env_name, scenarios)
+        return index
+    
+    def get_all_environments():
+        # 로드되지 않은 환경을 모두 먼저 요청해 동시에 로드한 뒤 완료 대기
+        for env_name in environments:
+            if env_name not in env_indexes and env_name not in env_futures:
+                request_environment(env_name)
+        for env_name in environments:
+            get_environment(env_name)
+    
+    # 초기 로드: 모든 환경 데이터를 백그라운드에서 동시에 로드 (메뉴는 바로 사용 가능)
+    for env_name in environments:
+        request_environment(env_name)
     
     print()
     
-    # 메인 루프
-    def print_menu():
-        print("=" * 80)
-        print("명령어:")
-        print("  0 또는 exit - 프로그램 종료")
-        print("  1 - DEV 환경 전체 시나리오 출력")
-        print("  2 - PROD 환경 전체 시나리오 출력")
-        print("  3 - STG 환경 전체 시나리오 출력")
-        print("  4 - 환경별 시나리오 비교")
-        print("  5 - 블록 검색 모드 (DEV, PROD, STG 모든 환경)")
-        print("  6 - 블록 ID 검증 (YAML 형식 텍스트)")
-        print("=" * 80)
+    # 입력 함수: 터미널이면 input(), 파이프 등이면 stdin에서 직접 읽기
+    read_input = input if sys.stdin.isatty() else read_stdin_line
     
+    # 메인 루프 (메뉴는 시작 시와 요청(?/help) 시에만 출력)
     print_menu()
     
     while True:
         try:
-            user_input = input("\n> ").strip()
+            user_input = read_input("\n> ").strip()
             
             # 2. 입력값이 "0" 또는 "exit"이면 프로그램 종료
             if user_input == "0" or user_input.lower() == "exit":
                 print("프로그램을 종료합니다.")
                 break
             
+            # 명령어 목록 다시 보기
+            elif user_input == "?" or user_input.lower() == "help":
+                print_menu()
+            
             # 3. 환경별 전체 시나리오 출력
             elif user_input == "1":  # DEV
-                if 'dev' not in env_scenarios:
-                    print("⚠️  DEV 환경 데이터가 없습니다. 먼저 로드해주세요.")
+                if get_environment('dev') is None:
+                    print("⚠️  DEV 환경 데이터를 로드할 수 없습니다.")
                 else:
                     display_all_scenarios(env_scenarios['dev'])
-                print_menu()
             
             elif user_input == "2":  # PROD
-                if 'prod' not in env_scenarios:
-                    # PROD 환경 데이터 로드
-                    prod_env = environments['prod']
-                    prod_cookie = os.getenv(prod_env['cookie_key'])
-                    prod_scenarios = load_environment_data('prod', prod_env['url'], prod_cookie)
-                    if prod_scenarios:
-                        env_scenarios['prod'] = prod_scenarios
-                
-                if 'prod' in env_scenarios:
-                    display_all_scenarios(env_scenarios['prod'])
-                else:
+                if get_environment('prod') is None:
                     print("⚠️  PROD 환경 데이터를 로드할 수 없습니다.")
-                print_menu()
+                else:
+                    display_all_scenarios(env_scenarios['prod'])
             
             elif user_input == "3":  # STG
-                if 'stg' not in env_scenarios:
-                    # STG 환경 데이터 로드
-                    stg_env = environments['stg']
-                    stg_cookie = os.getenv(stg_env['cookie_key'])
-                    stg_scenarios = load_environment_data('stg', stg_env['url'], stg_cookie)
-                    if stg_scenarios:
-                        env_scenarios['stg'] = stg_scenarios
-                
-                if 'stg' in env_scenarios:
-                    display_all_scenarios(env_scenarios['stg'])
-                else:
+                if get_environment('stg') is None:
                     print("⚠️  STG 환경 데이터를 로드할 수 없습니다.")
-                print_menu()
+                else:
+                    display_all_scenarios(env_scenarios['stg'])
             
             # 4. 환경별 비교
             elif user_input == "4":
-                # 필요한 환경 데이터가 없으면 로드
-                for env_name, env_config in environments.items():
-                    if env_name not in env_scenarios:
-                        cookie = os.getenv(env_config['cookie_key'])
-                        if env_name == 'dev' and not cookie:
-                            cookie = os.getenv('KAKAO_COOKIE')  # 하위 호환성
-                        scenarios = load_environment_data(env_name, env_config['url'], cookie)
-                        if scenarios:
-                            env_scenarios[env_name] = scenarios
+                # 모든 환경 데이터 로드 완료 대기 (실패한 환경은 다시 요청)
+                get_all_environments()
                 
                 if env_scenarios:
                     compare_environments(env_scenarios)
                 else:
                     print("⚠️  비교할 환경 데이터가 없습니다.")
-                print_menu()
             
             # 5. 블록 검색 모드 (모든 환경)
             elif user_input == "5":
-                # 필요한 환경 데이터가 없으면 로드
-                for env_name, env_config in environments.items():
-                    if env_name not in env_scenarios:
-                        cookie = os.getenv(env_config['cookie_key'])
-                        if env_name == 'dev' and not cookie:
-                            cookie = os.getenv('KAKAO_COOKIE')  # 하위 호환성
-                        scenarios = load_environment_data(env_name, env_config['url'], cookie)
-                        if scenarios:
-                            env_scenarios[env_name] = scenarios
+                # 모든 환경 데이터 로드 완료 대기 (실패한 환경은 다시 요청)
+                get_all_environments()
                 
                 if not env_scenarios:
                     print("⚠️  검색할 환경 데이터가 없습니다.")
-                    print_menu()
                     continue
                 
                 print("\n[검색 모드] 블록 이름 또는 블록 ID로 검색합니다. (DEV, PROD, STG 모든 환경)")
@@ -834,7 +1110,7 @@ def main():
                 # 검색 모드 루프
                 while True:
                     try:
-                        search_input = input("\n검색어> ").strip()
+                        search_input = read_input("\n검색어> ").strip()
                         
                         # 검색 모드 종료
                         if search_input == "0" or search_input.lower() == "exit":
@@ -845,21 +1121,18 @@ def main():
                         # 검색어로 검색
                         if search_input:
                             # 먼저 block ID로 검색 시도 (모든 환경에서)
-                            block_id_found = False
-                            for env_name, scenarios in env_scenarios.items():
-                                if scenarios:
-                                    block_info = search_blocks_by_id(scenarios, search_input)
-                                    if block_info:
-                                        block_id_found = True
-                                        break
+                            block_id_found = any(
+                                search_blocks_by_id(index, search_input)
+                                for index in env_indexes.values()
+                            )
                             
                             if block_id_found:
                                 # Block ID 검색 모드
-                                env_results = search_by_block_id_multi_env(env_scenarios, search_input)
+                                env_results = search_by_block_id_multi_env(env_indexes, search_input)
                                 display_block_id_search_results(env_results, search_input)
                             else:
                                 # 블록 이름 검색 모드
-                                env_results = search_blocks_multi_env(env_scenarios, search_input)
+                                env_results = search_blocks_multi_env(env_indexes, search_input)
                                 display_search_results_multi_env(env_results)
                             
                             print_search_menu()
@@ -887,7 +1160,7 @@ def main():
                 print("\n텍스트 입력 (빈 줄 두 번으로 종료):")
                 try:
                     while True:
-                        line = input()
+                        line = read_input()
                         if not line.strip():
                             empty_line_count += 1
                             if empty_line_count >= 2:
@@ -897,12 +1170,10 @@ def main():
                             lines.append(line)
                 except KeyboardInterrupt:
                     print("\n입력이 취소되었습니다.")
-                    print_menu()
                     continue
                 
                 if not lines:
                     print("입력된 텍스트가 없습니다.")
-                    print_menu()
                     continue
                 
                 # 텍스트 파싱
@@ -912,67 +1183,43 @@ def main():
                     
                     if not block_ids:
                         print("⚠️  블록 ID를 찾을 수 없습니다. 형식을 확인해주세요.")
-                        print_menu()
                         continue
                     
                     print(f"\n✓ {len(block_ids)}개의 블록 ID를 찾았습니다.")
                     
                     # 환경 선택
-                    print("\n검증할 환경을 선택하세요:")
-                    print("  1 - DEV")
-                    print("  2 - PROD")
-                    print("  3 - STG")
+                    sys.stdout.write(ENV_SELECT_STR)
+                    sys.stdout.flush()
                     
                     env_name = None
                     try:
                         while True:
-                            env_choice = input("\n환경 선택 (1/2/3)> ").strip()
-                            
-                            if env_choice == "1":
-                                env_name = 'dev'
-                                break
-                            elif env_choice == "2":
-                                env_name = 'prod'
+                            env_name = ENV_CHOICES.get(read_input("\n환경 선택 (1/2/3)> ").strip())
+                            if env_name:
                                 break
-                            elif env_choice == "3":
-                                env_name = 'stg'
-                                break
-                            else:
-                                print("1, 2, 3 중 하나를 입력하세요.")
+                            print("1, 2, 3 중 하나를 입력하세요.")
                     except KeyboardInterrupt:
                         print("\n취소되었습니다.")
-                        print_menu()
                         continue
                     
                     if env_name:
-                        # 선택한 환경 데이터 로드
-                        if env_name not in env_scenarios:
-                            env_config = environments[env_name]
-                            cookie = os.getenv(env_config['cookie_key'])
-                            if env_name == 'dev' and not cookie:
-                                cookie = os.getenv('KAKAO_COOKIE')  # 하위 호환성
-                            scenarios = load_environment_data(env_name, env_config['url'], cookie)
-                            if scenarios:
-                                env_scenarios[env_name] = scenarios
+                        # 선택한 환경 데이터 로드 완료 대기
+                        index = get_environment(env_name)
                         
-                        if env_name in env_scenarios:
+                        if index is not None:
                             # 검증 수행
-                            results = validate_block_ids(block_ids, env_scenarios[env_name], env_name)
+                            results = validate_block_ids(block_ids, index, env_name)
                             display_validation_results(results, env_name)
                         else:
                             print(f"⚠️  {env_name.upper()} 환경 데이터를 로드할 수 없습니다.")
-                    
-                    print_menu()
                 
                 except Exception as e:
                     print(f"❌ 오류 발생: {e}", file=sys.stderr)
                     import traceback
                     traceback.print_exc()
-                    print_menu()
             
             else:
-                print("잘못된 명령어입니다. 0, 1, 2, 3, 4, 5, 6 중 하나를 입력하세요.")
-                print_menu()
+                print("잘못된 명령어입니다. 0, 1, 2, 3, 4, 5, 6 중 하나를 입력하세요. (명령어 목록: ? 또는 help)")
         
         except KeyboardInterrupt:
             print("\n프로그램을 종료합니다.")